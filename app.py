@@ -1,23 +1,57 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, Response, render_template, request, jsonify, session, redirect, url_for, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 import os
+import re
 import sys
-import json
+import logging
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from datetime import date
+from functools import lru_cache
+import orjson
 import urllib.parse
-import urllib.request
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
 # Load env vars BEFORE importing memory engine modules
 # so that PINECONE_API_KEY, HF_TOKEN, etc. are available.
 load_dotenv()
 
-from groq import Groq
+from groq import Groq, NOT_GIVEN
+from google.auth import jwt as google_jwt
 
 # --- Memory Engine Imports (lazy — no API calls happen at import time) ---
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "zen_memory_engine"))
 from embedder import text_to_vector
 from database import save_memory, search_memories
 
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson (C encoder/decoder).  Calls that pass
+    json-module options (e.g. the session serializer's `object_hook`) go to
+    the stdlib provider, since orjson can't honour them.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+log = logging.getLogger("zen")
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 app.secret_key = os.getenv("SECRET_KEY", "zen-ai-super-secret-key-change-this")
 app.config.update(
     SESSION_COOKIE_SAMESITE="Lax",
@@ -28,8 +62,319 @@ GOOGLE_CLIENT_ID     = "701868092175-vu87aklo8km85cdqfd0v2fin9tsac63e.apps.googl
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
 REDIRECT_URI         = os.getenv("REDIRECT_URI", "http://localhost:10000/callback")
 
+GROQ_MODEL = "llama-3.3-70b-versatile"
+
 api_key = os.getenv("GROQ_API_KEY")
-client  = Groq(api_key=api_key)
+
+# Cap in-flight Groq completions per worker so a burst queues here instead of
+# tripping Groq's rate limits (gevent patches this into a cooperative lock).
+groq_slots = threading.BoundedSemaphore(int(os.getenv("GROQ_MAX_INFLIGHT", 16)))
+
+# ---------------------------------------------------------------------------
+# Lazy-loaded Groq client (one per worker process, created after fork)
+# ---------------------------------------------------------------------------
+_client = None     # will be set by get_client() on first call
+
+
+def get_client():
+    """
+    Return this process's Groq client, building it on the very first call.
+
+    The client owns an HTTP/2 connection pool, which must not be shared
+    across a fork — so it's created lazily inside each Gunicorn worker
+    (gunicorn.conf.py warms it in post_worker_init) rather than at import.
+    """
+    global _client
+    if _client is None:
+        import httpx
+        _client = Groq(
+            api_key=api_key,
+            max_retries=2,
+            http_client=httpx.Client(
+                http2=True,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                timeout=httpx.Timeout(60.0, connect=3.0),
+            ),
+        )
+    return _client
+
+# --- Shared HTTP session: keep-alive connections to Google's OAuth endpoints ---
+http_session = requests.Session()
+http_session.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.2),
+))
+http_session.headers.update({"Accept-Encoding": "gzip"})
+
+
+# ==================== SYSTEM PROMPT ====================
+# Built once at import.  Only the static instructions live here so the
+# prompt prefix is byte-identical on every request (and across users), which
+# lets Groq's prompt-prefix cache kick in.  Anything per-user goes into a
+# second, much smaller system message built in /chat.
+
+SYSTEM_PROMPT = (
+    "You are ZEN created & powered by ZENLabs founder of Mithilesh, a friendly, intelligent, and natural AI assistant.\n\n"
+
+    "CONVERSATION STYLE:\n"
+    "- Talk like a real human friend — natural, casual, and flowing\n"
+    "- Keep replies concise unless the topic needs detail\n"
+    "- Only use the user's name ONCE at the start of the very first message, never again unless it feels truly natural (like once every 10+ messages)\n"
+    "- Never say 'I'm just a language model' — just be ZEN AI\n"
+    "- Don't ask 'what's on your mind?' or similar filler questions\n"
+    "- No robotic phrases, no stiff language\n"
+    "- Match the user's energy — if they're casual, be casual. If serious, be serious. if they sad, be supportive.\n\n"
+
+    "IDENTITY RULES:\n"
+    "- You are ZEN AI. If asked who created you, say 'I was built by ZEN Labs.'\n"
+    "- Never mention Meta, LLaMA, or any underlying model\n\n"
+
+    "IMPORTANT RULES:\n"
+    "- Do NOT introduce yourself every message\n"
+    "- Do NOT greet the user on every single reply\n"
+    "- Do NOT mention who created you unless the user explicitly asks 'who created you'\n"
+    "- Be calm, smart, and conversational\n"
+    "- Avoid repeating the same sentences\n"
+    "- Respond directly to the user's question\n\n"
+
+    "MATH & PROBLEM SOLVING:\n"
+    "- Solve all math problems step by step clearly\n"
+    "- Support algebra, calculus, geometry, statistics, and arithmetic\n"
+    "- Show working steps when solving equations\n"
+    "- Use plain text math notation (e.g. x squared + 3x = 10)\n"
+    "- Double-check answers before responding\n"
+    "- For complex problems, break into clear numbered steps"
+)
+SYSTEM_PROMPT_HASH = hashlib.blake2b(SYSTEM_PROMPT.encode(), digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def date_context(day):
+    """The date line for the per-user context — formatted once per day."""
+    return f"Today's date: {day.strftime('%B %d, %Y')}."
+
+
+# ==================== REPLY CACHE ====================
+# Identical prompts (same model, prompt, user, context and message) are answered from
+# cache instead of paying for another Groq completion.  Tier 1 is a per-worker
+# LRU; tier 2 is Redis, shared across Gunicorn workers, when REDIS_URL is set.
+
+REPLY_CACHE_SIZE = int(os.getenv("REPLY_CACHE_SIZE", 2048))
+REPLY_CACHE_TTL  = int(os.getenv("REPLY_CACHE_TTL", 3600))
+
+_reply_cache      = OrderedDict()   # key -> (expires_at, reply)
+_reply_cache_lock = threading.Lock()
+_redis            = None            # will be set by get_redis() on first call
+
+
+def get_redis():
+    """
+    Return a Redis client if REDIS_URL is configured, connecting only on the
+    very first call.  Returns None when Redis isn't configured.
+    """
+    global _redis
+    if _redis is None and os.getenv("REDIS_URL"):
+        import redis
+        _redis = redis.Redis.from_url(os.getenv("REDIS_URL"), decode_responses=True)
+    return _redis
+
+
+def reply_cache_key(user_email, user_context, user_message):
+    """Hash everything that determines the completion into a short key."""
+    raw = f"{GROQ_MODEL}|{SYSTEM_PROMPT_HASH}|{user_email}|{user_context}|{user_message}".encode()
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def get_cached_reply(key):
+    """Look the key up in the local LRU, then Redis.  Returns None on a miss."""
+    with _reply_cache_lock:
+        entry = _reply_cache.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                _reply_cache.move_to_end(key)
+                return entry[1]
+            del _reply_cache[key]
+
+    r = get_redis()
+    if r is None:
+        return None
+    try:
+        reply = r.get(f"reply:{key}")
+    except Exception as e:
+        log.warning("Reply cache (redis) error: %s", e)
+        return None
+    if reply is not None:
+        _store_local_reply(key, reply)
+    return reply
+
+
+def cache_reply(key, reply):
+    """Store a finished reply in both cache tiers."""
+    _store_local_reply(key, reply)
+    r = get_redis()
+    if r is not None:
+        try:
+            r.setex(f"reply:{key}", REPLY_CACHE_TTL, reply)
+        except Exception as e:
+            log.warning("Reply cache (redis) error: %s", e)
+
+
+def _store_local_reply(key, reply):
+    with _reply_cache_lock:
+        _reply_cache[key] = (time.monotonic() + REPLY_CACHE_TTL, reply)
+        _reply_cache.move_to_end(key)
+        while len(_reply_cache) > REPLY_CACHE_SIZE:
+            _reply_cache.popitem(last=False)
+
+
+# ==================== GOOGLE SIGN-IN ====================
+# The token exchange already returns a signed ID token carrying name, email
+# and picture, so we verify it locally instead of making a second round-trip
+# to the userinfo endpoint.  Google's signing certs are cached for as long as
+# their Cache-Control max-age allows.
+
+GOOGLE_CERTS_URL  = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_ISSUERS    = ("accounts.google.com", "https://accounts.google.com")
+GOOGLE_CLOCK_SKEW = 10   # seconds of iat / exp leeway
+
+_google_certs        = None   # will be set by get_google_certs() on first call
+_google_certs_expiry = 0.0
+_google_certs_lock   = threading.Lock()
+
+
+def get_google_certs(refresh=False):
+    """
+    Return Google's ID-token signing certificates, fetching them only when
+    the cached copy has expired (or when `refresh` forces it).
+    """
+    global _google_certs, _google_certs_expiry
+    with _google_certs_lock:
+        if refresh or _google_certs is None or time.monotonic() >= _google_certs_expiry:
+            resp = http_session.get(GOOGLE_CERTS_URL, timeout=(2, 7))
+            resp.raise_for_status()
+
+            max_age = 3600
+            for directive in resp.headers.get("Cache-Control", "").split(","):
+                name, _, value = directive.strip().partition("=")
+                if name == "max-age" and value.isdigit():
+                    max_age = int(value)
+
+            _google_certs        = resp.json()
+            _google_certs_expiry = time.monotonic() + max_age
+        return _google_certs
+
+
+def verify_google_id_token(token):
+    """Verify a Google ID token against the cached certs and return its claims."""
+    certs = get_google_certs()
+    if google_jwt.decode_header(token).get("kid") not in certs:
+        # Signed with a key we haven't seen — Google has rotated its certs.
+        certs = get_google_certs(refresh=True)
+
+    # A little skew tolerance: a token minted a moment ago must not fail as
+    # "used too early" just because our clock runs slightly behind Google's.
+    claims = google_jwt.decode(
+        token,
+        certs=certs,
+        audience=GOOGLE_CLIENT_ID,
+        clock_skew_in_seconds=GOOGLE_CLOCK_SKEW,
+    )
+
+    if claims.get("iss") not in GOOGLE_ISSUERS:
+        raise ValueError(f"Unexpected ID token issuer: {claims.get('iss')}")
+    return claims
+
+
+# ==================== MEMORY ENGINE ====================
+# Embedding + Pinecone search run on a small pool so /chat can give up on
+# them after MEMORY_TIMEOUT seconds and answer without memories, and so the
+# final save never holds up the response.
+
+MEMORY_TIMEOUT = float(os.getenv("MEMORY_TIMEOUT", 1.5))
+MEMORY_LIMIT   = 5    # memories added to the prompt
+
+memory_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="memory")
+
+
+def recall_memories(email, message):
+    """
+    Embed a message and fetch the user's most relevant memories for it.
+    Extra matches are fetched so that, once /chat drops earlier copies of
+    the message itself, MEMORY_LIMIT distinct memories are usually left.
+    """
+    vector = text_to_vector(message)
+    return vector, search_memories(email, vector, limit=MEMORY_LIMIT * 2)
+
+
+def save_recalled_memory(recall, email, message):
+    """Once `recall` has produced the message's vector, store the message."""
+    try:
+        vector, _ = recall.result()
+        save_memory(email, message, vector)
+    except Exception as e:
+        log.error("Memory save error: %s", e)
+
+
+# ==================== HELPERS ====================
+
+# Small talk that only ever needs a short answer.  Anchored to the whole
+# message, so anything longer or more specific is left uncapped.
+_SMALL_TALK_RE = re.compile(
+    r"^\s*(hi|hii+|hello|hey|yo|sup|what'?s up|how are you|how'?s it going|good (morning|afternoon|evening|night)|"
+    r"thanks|thank you|thx|ty|ok|okay|k|cool|nice|great|awesome|lol|haha|yes|yeah|no|nope|sure|bye|goodbye|see you)"
+    r"(\s+(zen|bro|man|buddy|again|so much|a lot))?\s*[?!.]*\s*$",
+    re.IGNORECASE,
+)
+
+# Appended to a reply that hit max_tokens, so the cut isn't silent.
+TRUNCATED_MARKER = "\n\n[Reply cut short — it hit the length limit.]"
+
+
+def token_budget(message):
+    """
+    Pick max_tokens for a reply: small talk gets a tight cap, everything
+    else is left to the model (NOT_GIVEN sends no limit at all).
+    """
+    if _SMALL_TALK_RE.match(message):
+        return 512
+    return NOT_GIVEN
+
+
+# Identity questions have a fixed answer (see IDENTITY RULES in SYSTEM_PROMPT),
+# so they're answered here without a Groq call.  Anchored to the whole message
+# so longer questions that merely contain these phrases still reach the model.
+_CREATOR_RE = re.compile(
+    r"^\s*(hey\s+|so\s+)?(who|which company)\s+(made|created|built|developed|owns)\s+you\s*[?!.]*\s*$",
+    re.IGNORECASE,
+)
+_IDENTITY_RE = re.compile(
+    r"^\s*(hey\s+|so\s+)?(who\s+are\s+you|what('?s|\s+is)\s+your\s+(name|model)|what\s+model\s+are\s+you)\s*[?!.]*\s*$",
+    re.IGNORECASE,
+)
+
+
+def identity_reply(message):
+    """Return the canned reply for an identity question, or None."""
+    if _CREATOR_RE.match(message):
+        return "I was built by ZEN Labs."
+    if _IDENTITY_RE.match(message):
+        return "I'm ZEN AI, your friendly assistant. What can I help you with?"
+    return None
+
+
+def sse_event(payload):
+    """Encode one Server-Sent Events `data:` frame with orjson."""
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
+def sse_response(events):
+    """Wrap an iterator of SSE frames in an unbuffered streaming response."""
+    return Response(
+        stream_with_context(events),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 # ==================== ROUTES ====================
@@ -72,31 +417,32 @@ def callback():
 
     try:
         # Step 1: Exchange code for tokens
-        token_data = urllib.parse.urlencode({
-            "code":          code,
-            "client_id":     GOOGLE_CLIENT_ID,
-            "client_secret": GOOGLE_CLIENT_SECRET,
-            "redirect_uri":  REDIRECT_URI,
-            "grant_type":    "authorization_code"
-        }).encode()
-
-        token_req = urllib.request.Request(
+        token_resp = http_session.post(
             "https://oauth2.googleapis.com/token",
-            data=token_data,
-            method="POST"
-        )
-        with urllib.request.urlopen(token_req) as resp:
-            token_json = json.loads(resp.read())
-
-        access_token = token_json.get("access_token")
-
-        # Step 2: Use access token to get user info
-        userinfo_req = urllib.request.Request(
-            "https://www.googleapis.com/oauth2/v2/userinfo",
-            headers={"Authorization": f"Bearer {access_token}"}
+            data={
+                "code":          code,
+                "client_id":     GOOGLE_CLIENT_ID,
+                "client_secret": GOOGLE_CLIENT_SECRET,
+                "redirect_uri":  REDIRECT_URI,
+                "grant_type":    "authorization_code"
+            },
+            timeout=(2, 7)
         )
-        with urllib.request.urlopen(userinfo_req) as resp:
-            user_info = json.loads(resp.read())
+        token_resp.raise_for_status()
+        token_json = token_resp.json()
+
+        # Step 2: Read user info from the ID token (verified locally),
+        # falling back to the userinfo endpoint if Google didn't send one
+        if token_json.get("id_token"):
+            user_info = verify_google_id_token(token_json["id_token"])
+        else:
+            userinfo_resp = http_session.get(
+                "https://www.googleapis.com/oauth2/v2/userinfo",
+                headers={"Authorization": f"Bearer {token_json.get('access_token')}"},
+                timeout=(2, 7)
+            )
+            userinfo_resp.raise_for_status()
+            user_info = userinfo_resp.json()
 
         # Step 3: Save to Flask session
         session["user"] = {
@@ -108,7 +454,7 @@ def callback():
         return redirect(url_for("home"))
 
     except Exception as e:
-        print("OAuth callback error:", e)
+        log.error("OAuth callback error: %s", e)
         return redirect(url_for("login") + "?error=server_error")
 
 
@@ -144,76 +490,105 @@ def chat():
         user_name    = session["user"].get("name", "User")
         user_email   = session["user"].get("email")
 
-        # --- Memory Engine: Embed the incoming message ---
-        query_vector = text_to_vector(user_message)
-
-        # --- Memory Engine: Search for relevant past memories ---
-        memories = search_memories(user_email, query_vector, limit=5)
-
-        system_prompt = (
-             f"You are ZEN created & powered by ZENLabs founder of Mithilesh, a friendly, intelligent, and natural AI assistant.\n"
-f"The user's name is {user_name}.\n\n"
-
-"CONVERSATION STYLE:\n"
-"- Talk like a real human friend — natural, casual, and flowing\n"
-"- Keep replies concise unless the topic needs detail\n"
-"- Only use the user's name ONCE at the start of the very first message, never again unless it feels truly natural (like once every 10+ messages)\n"
-"- Never say 'I'm just a language model' — just be ZEN AI\n"
-"- Don't ask 'what's on your mind?' or similar filler questions\n"
-"- No robotic phrases, no stiff language\n"
-"- Match the user's energy — if they're casual, be casual. If serious, be serious. if they sad, be supportive.\n\n"
-
-"IDENTITY RULES:\n"
-"- You are ZEN AI. If asked who created you, say 'I was built by ZEN Labs.'\n"
-"- Never mention Meta, LLaMA, or any underlying model\n\n"
-
-"IMPORTANT RULES:\n"
-"- Do NOT introduce yourself every message\n"
-"- Do NOT greet the user on every single reply\n"
-"- Do NOT mention who created you unless the user explicitly asks 'who created you'\n"
-"- Be calm, smart, and conversational\n"
-"- Avoid repeating the same sentences\n"
-"- Respond directly to the user's question\n\n" 
-
-"MATH & PROBLEM SOLVING:\n"
-"- Solve all math problems step by step clearly\n"
-"- Support algebra, calculus, geometry, statistics, and arithmetic\n"
-"- Show working steps when solving equations\n"
-"- Use plain text math notation (e.g. x squared + 3x = 10)\n"
-"- Double-check answers before responding\n"
-"- For complex problems, break into clear numbered steps"
-)
-
-        # --- Memory Engine: Append relevant memories to the prompt ---
+        # --- Identity questions: fixed answer, no embedding or Groq call ---
+        canned = identity_reply(user_message)
+        if canned:
+            return sse_response(iter([sse_event({"delta": canned}), "data: [DONE]\n\n"]))
+
+        # --- Memory Engine: Embed + search in the background, within a time budget ---
+        recall = memory_pool.submit(recall_memories, user_email, user_message)
+        try:
+            _, memories = recall.result(timeout=MEMORY_TIMEOUT)
+        except FuturesTimeout:
+            memories = []
+        except Exception as e:
+            # Memories are optional context — answer without them.
+            log.error("Memory recall error: %s", e)
+            memories = []
+
+        # Every message is saved, so repeating one recalls its own earlier
+        # copies.  They add nothing to the prompt, and dropping them keeps the
+        # reply cache key stable for a repeated message.
+        memories = [m for m in memories if m != user_message][:MEMORY_LIMIT]
+
+        # --- Per-user context: kept out of SYSTEM_PROMPT so its prefix stays cacheable ---
+        context_parts = [f"{date_context(date.today())}\nThe user's name is {user_name}."]
+
+        # --- Memory Engine: Add relevant memories to the context ---
         if memories:
-            memories_text = "\n".join(f"- {m}" for m in memories)
-            system_prompt += f"\n\nHere are some relevant past memories about this user:\n{memories_text}"
+            context_parts.append(
+                "Here are some relevant past memories about this user:\n"
+                + "\n".join("- " + m for m in memories)
+            )
 
         # --- Display Name: override how ZEN addresses the user ---
         display_name = session.get("display_name")
         if display_name:
-            system_prompt += f"\n\nCRITICAL INSTRUCTION: The user prefers to be called '{display_name}'. Address them by this name naturally in conversation."
-
-        response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ]
-        )
+            context_parts.append(f"CRITICAL INSTRUCTION: The user prefers to be called '{display_name}'. Address them by this name naturally in conversation.")
 
-        reply = response.choices[0].message.content
+        user_context = "\n\n".join(context_parts)
 
-        # --- Memory Engine: Save the user's message for future recall ---
-        save_memory(user_email, user_message, query_vector)
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "system", "content": user_context},
+            {"role": "user", "content": user_message}
+        ]
 
-        return jsonify({"response": reply})
+        # --- Reply Cache: skip Groq for a prompt we've just answered for this user ---
+        # The key includes the recalled memories, so a newly saved fact that
+        # matches the message changes the key instead of replaying a stale reply.
+        cache_key = reply_cache_key(user_email, user_context, user_message)
+        cached    = get_cached_reply(cache_key)
 
     except Exception as e:
         return jsonify({"response": "Server error: " + str(e)})
 
+    def generate():
+        """Forward Groq tokens to the browser as Server-Sent Events."""
+        if cached is not None:
+            yield sse_event({"delta": cached})
+        else:
+            parts = []
+            try:
+                # Hold a Groq slot for the whole stream; closing the generator
+                # (e.g. the browser disconnects) releases it.
+                with groq_slots:
+                    stream = get_client().chat.completions.create(
+                        model=GROQ_MODEL,
+                        messages=messages,
+                        max_tokens=token_budget(user_message),
+                        stream=True
+                    )
+                    truncated = False
+                    for chunk in stream:
+                        if not chunk.choices:
+                            continue
+                        delta = chunk.choices[0].delta.content or ""
+                        if delta:
+                            parts.append(delta)
+                            yield sse_event({"delta": delta})
+                        if chunk.choices[0].finish_reason == "length":
+                            truncated = True
+                            yield sse_event({"delta": TRUNCATED_MARKER})
+                # Only cache complete replies — an empty one would replay as a
+                # blank bubble, a truncated one would keep being cut short.
+                if parts and not truncated:
+                    cache_reply(cache_key, "".join(parts))
+            except Exception as e:
+                yield sse_event({"delta": "Server error: " + str(e)})
+        yield "data: [DONE]\n\n"
+
+    # --- Memory Engine: Save the user's message for future recall (off the request path) ---
+    memory_pool.submit(save_recalled_memory, recall, user_email, user_message)
+
+    return sse_response(generate())
+
 
 if __name__ == "__main__":
+    # Local development only — production runs under Gunicorn with gevent
+    # workers (see gunicorn.conf.py / Procfile).
+    if os.getenv("FLASK_ENV", "development") != "development":
+        sys.exit("Refusing to start the Flask dev server outside development; run `gunicorn app:app` instead.")
     # Grab the port from the cloud host, but fall back to 10000 for local testing
     port = int(os.environ.get("PORT", 10000))
     app.run(host="0.0.0.0", port=port)
\ No newline at end of file
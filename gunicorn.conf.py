@@ -0,0 +1,47 @@
+"""
+gunicorn.conf.py — Production server settings for ZEN AI
+=========================================================
+Gunicorn picks this file up automatically from the working directory, so
+the start command stays simply:
+
+    gunicorn app:app
+
+Every /chat request spends most of its time waiting on HuggingFace,
+Pinecone and Groq over HTTP.  gevent workers let one process keep serving
+other requests while those calls are in flight, and several processes
+side-step the GIL.
+
+Optional env vars:
+  PORT             — port to bind (default 10000)
+  GUNICORN_WORKERS — number of worker processes (default 2).  Each worker is a
+                     full copy of the app with its own caches, so raise this
+                     only when the instance has the memory for it.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '10000')}"
+reuse_port = True   # SO_REUSEPORT: a new master can bind while the old one drains
+
+# --- Workers ---
+# cpu_count() reports the host, not the container quota, so stay small by
+# default — each gevent worker already serves many connections at once.
+workers = int(os.getenv("GUNICORN_WORKERS", "2"))
+worker_class = "gevent"
+worker_connections = 1000
+keepalive = 75
+
+# --- Recycle workers periodically to guard against slow leaks ---
+max_requests = 1000
+max_requests_jitter = 100
+
+
+def post_worker_init(worker):
+    """Build this worker's Groq client and open its connection up front."""
+    from app import get_client
+    try:
+        # Bounded well under Gunicorn's worker timeout: the worker isn't
+        # heartbeating yet, so a stalled Groq would get it killed and rebooted.
+        get_client().with_options(timeout=5.0, max_retries=0).models.list()
+    except Exception as e:
+        worker.log.warning("Groq warm-up failed: %s", e)
@@ -13,10 +13,31 @@ Key design decisions:
   • All users share a single Pinecone index ("chatbot-memory").
   • User isolation is achieved via metadata filtering on the email field.
   • Each vector stores: id, embedding, metadata = {email, text}.
+  • Vectors arrive unit-length from embedder.text_to_vector(), so cosine
+    similarity equals the plain dot product; an index created with
+    metric="dotproduct" returns the same ranking with less work per
+    comparison than metric="cosine".
+  • When MEMORY_TEXT_DB is set, long texts are kept in a local SQLite
+    side store and only a METADATA_TEXT_LIMIT-char preview goes into
+    Pinecone metadata (flagged has_full), keeping upsert/query payloads
+    small.  The full text is fetched by ID for the matches only.
+  • Writes are batched: save_memory() only queues the vector, and a
+    background thread upserts up to UPSERT_BATCH_SIZE vectors per request
+    every UPSERT_FLUSH_INTERVAL seconds, so Pinecone latency stays off the
+    caller's critical path.
 
 Required env vars:
   PINECONE_API_KEY — your Pinecone API key (free at app.pinecone.io)
 
+Optional env vars:
+  PINECONE_GRPC — set to 1 to talk to Pinecone over gRPC (HTTP/2, protobuf)
+                  instead of REST.  Needs `pip install "pinecone[grpc]"`.
+                  Leave it off under gevent workers (the Flask app): the
+                  gRPC core doesn't yield to gevent and would block them.
+  MEMORY_TEXT_DB — path to a SQLite file for full texts of long memories.
+                   Unset (the default) keeps every full text in Pinecone,
+                   which is the safe choice on hosts with ephemeral disks.
+
 Usage:
     from database import save_memory, search_memories
     save_memory("user@example.com", "Hello world", [0.1, 0.2, ...])
@@ -25,12 +46,77 @@ Usage:
 
 import os
 import uuid
+import logging
+import sqlite3
+import time
+import queue
+import atexit
+import threading
+
+log = logging.getLogger("zen.memory")
 
 # ---------------------------------------------------------------------------
 # Lazy-loaded Pinecone index (created on first request, not at import)
 # ---------------------------------------------------------------------------
 INDEX_NAME = "chatbot-memory"
 _index = None      # will be set by get_index() on first call
+_index_lock = threading.Lock()
+
+# ---------------------------------------------------------------------------
+# Batched upserts (background flusher, started together with the index)
+# ---------------------------------------------------------------------------
+UPSERT_BATCH_SIZE = 100       # max vectors per upsert request
+UPSERT_FLUSH_INTERVAL = 0.5   # seconds to wait for a batch to fill up
+
+_upsert_queue = queue.Queue(maxsize=10000)
+_flusher = None    # background thread, started by get_index()
+_stopping = threading.Event()
+
+
+# ---------------------------------------------------------------------------
+# Optional side store for long memory texts (lazily opened, SQLite)
+# ---------------------------------------------------------------------------
+METADATA_TEXT_LIMIT = 200     # chars of text kept in Pinecone metadata
+
+_text_db = None    # will be set by get_text_db() on first call
+_text_db_lock = threading.Lock()
+
+
+def get_text_db():
+    """
+    Return the SQLite connection for full memory texts, opening it on the
+    very first call.  Returns None when MEMORY_TEXT_DB isn't configured.
+    """
+    global _text_db
+    if _text_db is None and os.getenv("MEMORY_TEXT_DB"):
+        with _text_db_lock:
+            if _text_db is None:
+                conn = sqlite3.connect(os.getenv("MEMORY_TEXT_DB"), check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("CREATE TABLE IF NOT EXISTS memories (id TEXT PRIMARY KEY, text TEXT NOT NULL)")
+                conn.commit()
+                _text_db = conn
+    return _text_db
+
+
+def _store_full_text(memory_id, text):
+    db = get_text_db()
+    with _text_db_lock:
+        db.execute("INSERT OR REPLACE INTO memories (id, text) VALUES (?, ?)", (memory_id, text))
+        db.commit()
+
+
+def _load_full_texts(memory_ids):
+    """Fetch full texts for the given IDs in one query → {id: text}."""
+    db = get_text_db()
+    if db is None or not memory_ids:
+        return {}
+    placeholders = ",".join("?" * len(memory_ids))
+    with _text_db_lock:
+        rows = db.execute(
+            f"SELECT id, text FROM memories WHERE id IN ({placeholders})", memory_ids
+        ).fetchall()
+    return dict(rows)
 
 
 def get_index():
@@ -40,20 +126,82 @@ def get_index():
     """
     global _index
     if _index is None:
-        from pinecone import Pinecone
-        pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-        _index = pc.Index(INDEX_NAME)
-        print(f"[database] Connected to Pinecone index: {INDEX_NAME}")
+        with _index_lock:
+            if _index is None:
+                pc = _make_client(os.getenv("PINECONE_API_KEY"))
+                _index = pc.Index(INDEX_NAME)
+                log.info("Connected to Pinecone index: %s", INDEX_NAME)
+                _start_flusher()
     return _index
 
 
+def _make_client(api_key):
+    """
+    Build the Pinecone client: the gRPC flavour when PINECONE_GRPC=1 and
+    its extras are installed, otherwise the default REST client.
+    """
+    if os.getenv("PINECONE_GRPC") == "1":
+        try:
+            from pinecone.grpc import PineconeGRPC
+            return PineconeGRPC(api_key=api_key)
+        except ImportError:
+            log.warning("PINECONE_GRPC=1 but pinecone[grpc] is not installed; using REST")
+
+    from pinecone import Pinecone
+    return Pinecone(api_key=api_key)
+
+
+def _start_flusher():
+    """Start the background upsert thread and make sure it drains on exit."""
+    global _flusher
+    _flusher = threading.Thread(target=_flush_loop, name="pinecone-upsert", daemon=True)
+    _flusher.start()
+    atexit.register(_stop_flusher)
+
+
+def _flush_loop():
+    """
+    Drain the upsert queue forever: take the first waiting vector, gather
+    more until the batch is full or UPSERT_FLUSH_INTERVAL has passed, then
+    send them all in a single upsert.
+    """
+    while not (_stopping.is_set() and _upsert_queue.empty()):
+        try:
+            batch = [_upsert_queue.get(timeout=UPSERT_FLUSH_INTERVAL)]
+        except queue.Empty:
+            continue
+
+        deadline = time.monotonic() + UPSERT_FLUSH_INTERVAL
+        while len(batch) < UPSERT_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_upsert_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        try:
+            _index.upsert(vectors=batch)
+        except Exception as e:
+            log.error("Upsert of %d memories failed: %s", len(batch), e)
+
+
+def _stop_flusher():
+    """Flush whatever is still queued before the process exits."""
+    _stopping.set()
+    if _flusher is not None:
+        _flusher.join(timeout=10)
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 def save_memory(email: str, text: str, vector: list[float]) -> str:
     """
     Persist a piece of text and its vector embedding for a specific user
-    in Pinecone.
+    in Pinecone.  The vector is queued and upserted by the background
+    flusher; if the queue is full it is upserted synchronously instead.
 
     Parameters
     ----------
@@ -74,21 +222,31 @@ def save_memory(email: str, text: str, vector: list[float]) -> str:
     # Generate a unique ID for this memory entry.
     memory_id = str(uuid.uuid4())
 
-    # Upsert the vector with metadata into Pinecone.
-    idx.upsert(
-        vectors=[
-            {
-                "id": memory_id,
-                "values": vector,
-                "metadata": {
-                    "email": email,
-                    "text": text,
-                },
-            }
-        ]
-    )
+    metadata = {
+        "email": email,
+        "text": text,
+    }
+
+    # Keep long texts out of Pinecone when a side store is configured.
+    if len(text) > METADATA_TEXT_LIMIT and get_text_db() is not None:
+        _store_full_text(memory_id, text)
+        metadata["text"] = text[:METADATA_TEXT_LIMIT]
+        metadata["has_full"] = True
 
-    print(f"[database] Saved memory {memory_id} for {email}")
+    record = {
+        "id": memory_id,
+        "values": vector,
+        "metadata": metadata,
+    }
+
+    # Hand the vector to the background flusher; only block on Pinecone
+    # ourselves if it has fallen too far behind.
+    try:
+        _upsert_queue.put_nowait(record)
+    except queue.Full:
+        idx.upsert(vectors=[record])
+
+    log.debug("Saved memory %s for %s", memory_id, email)
     return memory_id
 
 
@@ -127,12 +285,19 @@ def search_memories(
         filter={"email": {"$eq": email}},
     )
 
+    matches = results.get("matches", [])
+
+    # Swap previews for full texts, fetched in one query for just these IDs.
+    full_texts = _load_full_texts(
+        [m.get("id") for m in matches if m.get("metadata", {}).get("has_full")]
+    )
+
     # Extract the text from each match's metadata.
     documents = []
-    for match in results.get("matches", []):
-        text = match.get("metadata", {}).get("text", "")
+    for match in matches:
+        text = full_texts.get(match.get("id")) or match.get("metadata", {}).get("text", "")
         if text:
             documents.append(text)
 
-    print(f"[database] Found {len(documents)} memories for {email}")
+    log.debug("Found %d memories for %s", len(documents), email)
     return documents
@@ -9,16 +9,31 @@ IMPORTANT — Lazy Initialisation:
   is read and the HTTP request is made only inside text_to_vector()
   when explicitly called.  This prevents Gunicorn startup timeouts.
 
+Vector invariant:
+  Every vector returned by text_to_vector() has unit L2 norm, so cosine
+  similarity and dot product are the same thing downstream.  Normalisation
+  happens here, once, and nowhere else.
+
 Required env var:
   HF_TOKEN — your HuggingFace access token (free at huggingface.co/settings/tokens)
 
 Usage:
-    from embedder import text_to_vector
+    from embedder import text_to_vector, texts_to_vectors
     vec = text_to_vector("Hello, how are you?")   # returns list[float]
+    vecs = texts_to_vectors(["hi", "thanks"])     # one API call, list of vectors
 """
 
 import os
+import math
+import array
+import hashlib
+import threading
+from collections import OrderedDict
+
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # ---------------------------------------------------------------------------
 # HuggingFace Inference API Configuration (lightweight constants only)
@@ -27,14 +42,83 @@ HF_API_URL = (
     "https://router.huggingface.co/hf-inference/models/sentence-transformers/all-MiniLM-L6-v2/pipeline/feature-extraction"
 )
 
+# ---------------------------------------------------------------------------
+# Shared HTTP session — keeps the TCP + TLS connection to HuggingFace alive
+# between calls.  Creating it does no network I/O.
+# ---------------------------------------------------------------------------
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=["POST"],      # embedding is idempotent
+        raise_on_status=False,         # hand back the last response so its HF error body is raised
+    ),
+))
+
+
+# ---------------------------------------------------------------------------
+# In-process LRU of recent embeddings
+# ---------------------------------------------------------------------------
+# all-MiniLM-L6-v2 lower-cases its input and its tokenizer splits on any run
+# of whitespace, so texts that differ only in case or spacing embed to the
+# same vector and share one cache entry.  Vectors are kept as packed float32
+# arrays (~1.5 KB each, versus ~12 KB as a tuple of Python floats) — ample
+# precision for cosine search.
+EMBED_CACHE_SIZE = int(os.getenv("EMBED_CACHE_SIZE", 4096))
+
+_cache = OrderedDict()     # blake2b(normalised text) -> array('f')
+_cache_lock = threading.Lock()
+_cache_hits = 0
+_cache_misses = 0
+
+
+def _cache_key(text: str) -> str:
+    """Hash the normalised text so long messages don't bloat the cache keys."""
+    normalised = " ".join(text.lower().split())
+    return hashlib.blake2b(normalised.encode(), digest_size=16).hexdigest()
+
+
+def _cache_get(key: str):
+    global _cache_hits, _cache_misses
+    with _cache_lock:
+        vector = _cache.get(key)
+        if vector is not None:
+            _cache.move_to_end(key)
+            _cache_hits += 1
+        else:
+            _cache_misses += 1
+        return vector
+
+
+def _cache_put(key: str, vector: list[float]) -> None:
+    with _cache_lock:
+        _cache[key] = array.array("f", vector)
+        _cache.move_to_end(key)
+        while len(_cache) > EMBED_CACHE_SIZE:
+            _cache.popitem(last=False)
+
 
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
+def cache_stats() -> dict[str, int]:
+    """
+    Return the embedding cache's lifetime hit / miss counts and its current
+    number of entries (for metrics and cache sizing).
+    """
+    with _cache_lock:
+        return {"hits": _cache_hits, "misses": _cache_misses, "size": len(_cache)}
+
+
 def text_to_vector(text: str) -> list[float]:
     """
     Convert a string of text into a 384-dimensional vector embedding
-    via the HuggingFace Inference API.
+    via the HuggingFace Inference API.  Recently embedded texts are served
+    from an in-process LRU cache without an API call.
 
     Parameters
     ----------
@@ -45,33 +129,123 @@ def text_to_vector(text: str) -> list[float]:
     -------
     list[float]
         A list of 384 floating-point numbers representing the semantic
-        meaning of the input text.
+        meaning of the input text.  A fresh list on every call, so callers
+        may mutate it.
+
+    Raises
+    ------
+    RuntimeError
+        If the API call fails or returns an unexpected format.
+    """
+    key = _cache_key(text)
+    cached = _cache_get(key)
+    if cached is not None:
+        return list(cached)
+
+    vector = _fetch_vector(text)
+    _cache_put(key, vector)
+    return vector
+
+
+def texts_to_vectors(texts: list[str]) -> list[list[float]]:
+    """
+    Batch version of text_to_vector(): embed many texts with at most one
+    HuggingFace Inference API request, covering only the texts that aren't
+    already cached.
+
+    Parameters
+    ----------
+    texts : list[str]
+        The raw texts to embed.
+
+    Returns
+    -------
+    list[list[float]]
+        One 384-dimensional vector per input text, in the same order.
 
     Raises
     ------
     RuntimeError
         If the API call fails or returns an unexpected format.
     """
+    vectors = [None] * len(texts)
+    missing = {}       # cache key -> positions in `texts` that need it
+
+    for pos, text in enumerate(texts):
+        key = _cache_key(text)
+        cached = _cache_get(key)
+        if cached is not None:
+            vectors[pos] = list(cached)
+        else:
+            missing.setdefault(key, []).append(pos)
+
+    if missing:
+        fetched = _fetch_vectors([texts[positions[0]] for positions in missing.values()])
+        for (key, positions), vector in zip(missing.items(), fetched):
+            _cache_put(key, vector)
+            for pos in positions:
+                vectors[pos] = list(vector)
+
+    return vectors
+
+
+# ---------------------------------------------------------------------------
+# HuggingFace API calls
+# ---------------------------------------------------------------------------
+def _post(inputs):
+    """POST `inputs` (a string or a list of strings) and return the parsed JSON."""
     # Read the token at call time (after load_dotenv has run in app.py).
-    hf_token = os.getenv("HF_TOKEN")
+    auth = f"Bearer {os.getenv('HF_TOKEN')}"
+    if _session.headers.get("Authorization") != auth:
+        _session.headers["Authorization"] = auth
 
-    headers = {"Authorization": f"Bearer {hf_token}"}
-    payload = {"inputs": text, "options": {"wait_for_model": True}}
+    payload = {"inputs": inputs, "options": {"wait_for_model": True}}
 
-    response = requests.post(HF_API_URL, headers=headers, json=payload)
+    response = _session.post(HF_API_URL, json=payload, timeout=(3.05, 20))
 
     if response.status_code != 200:
         raise RuntimeError(
             f"HuggingFace API error {response.status_code}: {response.text}"
         )
 
-    result = response.json()
+    return orjson.loads(response.content)
+
+
+def _fetch_vector(text: str) -> list[float]:
+    """Embed `text` with one HuggingFace Inference API request (no cache)."""
+    result = _post(text)
 
     # The API returns a nested list for single inputs: [[0.1, 0.2, ...]]
     # We need the inner list.
     if isinstance(result, list) and len(result) > 0:
         if isinstance(result[0], list):
-            return result[0]      # [[0.1, ...]] → [0.1, ...]
-        return result             # [0.1, ...] already flat
+            return _normalise(result[0])   # [[0.1, ...]] → [0.1, ...]
+        return _normalise(result)          # [0.1, ...] already flat
 
     raise RuntimeError(f"Unexpected API response format: {result}")
+
+
+def _fetch_vectors(texts: list[str]) -> list[list[float]]:
+    """Embed several texts with one HuggingFace Inference API request (no cache)."""
+    result = _post(texts)
+
+    # A list of inputs comes back as one vector per input: [[...], [...]]
+    if (
+        isinstance(result, list)
+        and len(result) == len(texts)
+        and all(isinstance(vector, list) for vector in result)
+    ):
+        return [_normalise(vector) for vector in result]
+
+    raise RuntimeError(f"Unexpected API response format: {result}")
+
+
+def _normalise(vector: list[float]) -> list[float]:
+    """
+    Scale `vector` to unit L2 norm.  all-MiniLM-L6-v2 normally returns
+    unit vectors already, in which case the input is returned untouched.
+    """
+    norm = math.sqrt(math.fsum(x * x for x in vector))
+    if norm == 0.0 or abs(norm - 1.0) < 1e-6:
+        return vector
+    return [x / norm for x in vector]
@@ -1,16 +1,21 @@
 """
 memory_api.py — FastAPI Server for the Memory Engine
 =====================================================
-This is the entry-point for the standalone microservice. It exposes two
-POST endpoints:
+This is the entry-point for the standalone microservice. It exposes four
+POST endpoints (plus Prometheus metrics at GET /metrics):
 
-  POST /remember   — store a new memory for a user
-  POST /recall     — retrieve relevant past memories for a user
+  POST /remember         — store a new memory for a user
+  POST /recall           — retrieve relevant past memories for a user
+  POST /remember/batch   — store up to MAX_BATCH_ITEMS memories at once
+  POST /recall/batch     — run up to MAX_BATCH_ITEMS recalls at once
 
 Data flow:
   1. Client sends JSON  →  FastAPI validates it with Pydantic models
-  2. The text is embedded via the HuggingFace Inference API
-  3. The vector + text are saved / searched via Pinecone
+  2. The text is embedded via the HuggingFace Inference API — requests
+     arriving together are coalesced by a background worker into a single
+     batched API call
+  3. The vector + text are saved / searched via Pinecone (in a worker
+     thread, so the event loop never blocks)
   4. A JSON response is returned to the client
 
 Required env vars:
@@ -18,15 +23,139 @@ Required env vars:
   PINECONE_API_KEY — Pinecone API key
 
 Run with:
-    uvicorn memory_api:app --reload --port 8100
+    uvicorn memory_api:app --reload --port 8100          # development
+    python memory_api.py                                 # production
+
+Optional env vars:
+  ZEN_WORKERS — uvicorn worker processes for `python memory_api.py`
+                (default: 1).  Each worker keeps its own caches and /metrics
+                counters, so a scrape only sees the worker that answered it.
+  ZEN_HTTP2   — set to 1 to serve with hypercorn instead, so bursty clients
+                can multiplex many requests over one HTTP/2 connection
+                (h2 via ALPN behind TLS, or cleartext h2c with prior knowledge)
 """
 
+import os
+import sys
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Annotated
+
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, EmailStr
+from fastapi.responses import ORJSONResponse
+from pydantic import AfterValidator, BaseModel, Field, StringConstraints
+from prometheus_client import make_asgi_app
+from starlette.concurrency import run_in_threadpool
 
 # Import our internal modules — they live in the same package.
-from embedder import text_to_vector
-from database import save_memory, search_memories
+from embedder import texts_to_vectors
+from database import get_index, save_memory, search_memories
+from metrics import DB_CALLS, RECALL_SECONDS
+
+
+log = logging.getLogger("zen.memory")
+
+
+# ---------------------------------------------------------------------------
+# Batched embedding worker
+# ---------------------------------------------------------------------------
+EMBED_MAX_BATCH = 32       # max texts per HuggingFace request
+EMBED_MAX_INFLIGHT = 4     # max concurrent HuggingFace requests
+
+_embed_queue = None        # asyncio.Queue, created in lifespan()
+_embed_tasks = set()       # strong refs so running batches aren't GC'd
+
+
+async def embed(text: str) -> list[float]:
+    """Queue `text` for the batching worker and wait for its vector."""
+    future = asyncio.get_running_loop().create_future()
+    await _embed_queue.put((text, future))
+    return await future
+
+
+async def _embed_worker():
+    """
+    Pull queued texts and embed them in batches.  While all in-flight slots
+    are busy, new texts pile up in the queue and go out together in the
+    next batch.
+    """
+    slots = asyncio.Semaphore(EMBED_MAX_INFLIGHT)
+    while True:
+        items = [await _embed_queue.get()]
+        await slots.acquire()
+        while len(items) < EMBED_MAX_BATCH and not _embed_queue.empty():
+            items.append(_embed_queue.get_nowait())
+
+        task = asyncio.create_task(_embed_batch(items, slots))
+        _embed_tasks.add(task)
+        task.add_done_callback(_embed_tasks.discard)
+
+
+async def _embed_batch(items, slots):
+    """Embed one batch in a worker thread and resolve each waiting future."""
+    try:
+        vectors = await run_in_threadpool(texts_to_vectors, [text for text, _ in items])
+    except Exception as e:
+        for _, future in items:
+            if not future.done():
+                future.set_exception(e)
+    else:
+        for (_, future), vector in zip(items, vectors):
+            if not future.done():
+                future.set_result(vector)
+    finally:
+        slots.release()
+
+
+# Tiny utterances that make up a large share of chat traffic.  Their vectors
+# are fetched once at startup (one batched call), so these requests are
+# answered straight from the embedder's cache.
+COMMON_TEXTS = [
+    "hi", "hello", "hey", "thanks", "thank you", "ok", "okay", "yes", "no",
+    "bye", "good morning", "good night", "how are you", "what's my name",
+    "who am i",
+]
+
+
+async def _prime_common_texts():
+    """Warm the embedding cache with COMMON_TEXTS; failure is only logged."""
+    try:
+        await run_in_threadpool(texts_to_vectors, COMMON_TEXTS)
+    except Exception as e:
+        log.warning("Could not pre-embed common texts: %s", e)
+
+
+async def _connect_pinecone():
+    """
+    Resolve the Pinecone index (and start its upsert flusher) up front, so
+    the first request doesn't pay for the index lookup and TLS handshake.
+    """
+    try:
+        await run_in_threadpool(get_index)
+    except Exception as e:
+        log.warning("Could not connect to Pinecone at startup: %s", e)
+
+
+async def _warm_up():
+    """Open the HuggingFace and Pinecone connections before traffic arrives."""
+    await asyncio.gather(_prime_common_texts(), _connect_pinecone())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start the embedding worker with the server and stop it on shutdown.
+    Warm-up runs in the background so it never delays startup.
+    """
+    global _embed_queue
+    _embed_queue = asyncio.Queue()
+    worker = asyncio.create_task(_embed_worker())
+    warm_up = asyncio.create_task(_warm_up())
+    yield
+    warm_up.cancel()
+    worker.cancel()
 
 # ---------------------------------------------------------------------------
 # FastAPI App
@@ -36,15 +165,37 @@ app = FastAPI(
     description="Long-Term Memory microservice — store and recall user chat "
                 "history as semantic vector embeddings (cloud-native).",
     version="2.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,   # orjson encodes every response
 )
+app.mount("/metrics", make_asgi_app())
 
 
 # ---------------------------------------------------------------------------
 # Request / Response Schemas (Pydantic models)
 # ---------------------------------------------------------------------------
+# Request models validate input.  The *Response models only document the
+# endpoints in OpenAPI — handlers return ORJSONResponse directly, so FastAPI
+# doesn't re-validate and re-encode every response through Pydantic.
+# The email is only a partition key, so a cheap anchored pattern is enough —
+# no RFC parsing or IDNA.  The domain is lower-cased as EmailStr did, so keys
+# of memories saved before stay the same.  Interning lets repeat users share
+# one string.
+def _normalise_email(value: str) -> str:
+    local, _, domain = value.rpartition("@")
+    return sys.intern(f"{local}@{domain.lower()}")
+
+
+Email = Annotated[
+    str,
+    StringConstraints(pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$", max_length=254),
+    AfterValidator(_normalise_email),
+]
+
+
 class RememberRequest(BaseModel):
     """Schema for the /remember endpoint."""
-    email: EmailStr          # validated email address
+    email: Email             # validated email address
     text: str                # the chat message or snippet to store
 
 
@@ -56,7 +207,7 @@ class RememberResponse(BaseModel):
 
 class RecallRequest(BaseModel):
     """Schema for the /recall endpoint."""
-    email: EmailStr          # whose memories to search
+    email: Email             # whose memories to search
     query_text: str          # the question / prompt to search with
 
 
@@ -67,6 +218,30 @@ class RecallResponse(BaseModel):
     memories: list[str]      # the retrieved text snippets
 
 
+MAX_BATCH_ITEMS = 64         # cap on items per batch request
+
+
+class RememberBatchRequest(BaseModel):
+    """Schema for the /remember/batch endpoint."""
+    items: list[RememberRequest] = Field(min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class RememberBatchResponse(BaseModel):
+    """Schema for the /remember/batch response."""
+    status: str
+    memory_ids: list[str]    # one ID per item, in request order
+
+
+class RecallBatchRequest(BaseModel):
+    """Schema for the /recall/batch endpoint."""
+    items: list[RecallRequest] = Field(min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class RecallBatchResponse(BaseModel):
+    """Schema for the /recall/batch response."""
+    results: list[RecallResponse]    # one result per item, in request order
+
+
 # ---------------------------------------------------------------------------
 # Health-check endpoint
 # ---------------------------------------------------------------------------
@@ -79,28 +254,30 @@ async def health_check():
 # ---------------------------------------------------------------------------
 # POST /remember — store a new memory
 # ---------------------------------------------------------------------------
-@app.post("/remember", response_model=RememberResponse, tags=["Memory"])
+@app.post("/remember", responses={200: {"model": RememberResponse}}, tags=["Memory"])
 async def remember(request: RememberRequest):
     """
     Accept a piece of text from a user and store it as a vector embedding
     in Pinecone.
     """
     try:
-        # Step 1 — Convert text to vector via HuggingFace API.
-        vector = text_to_vector(request.text)
+        # Step 1 — Convert text to vector via HuggingFace API (batched).
+        vector = await embed(request.text)
 
         # Step 2 — Persist to Pinecone.
-        memory_id = save_memory(
+        DB_CALLS.labels(op="save").inc()
+        memory_id = await run_in_threadpool(
+            save_memory,
             email=request.email,
             text=request.text,
             vector=vector,
         )
 
         # Step 3 — Respond with success.
-        return RememberResponse(
-            status="saved",
-            memory_id=memory_id,
-        )
+        return ORJSONResponse({
+            "status": "saved",
+            "memory_id": memory_id,
+        })
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -109,30 +286,116 @@ async def remember(request: RememberRequest):
 # ---------------------------------------------------------------------------
 # POST /recall — retrieve relevant memories
 # ---------------------------------------------------------------------------
-@app.post("/recall", response_model=RecallResponse, tags=["Memory"])
+@app.post("/recall", responses={200: {"model": RecallResponse}}, tags=["Memory"])
 async def recall(request: RecallRequest):
     """
     Search a user's stored memories in Pinecone for snippets semantically
     similar to the provided query text.
     """
+    started = time.perf_counter()
     try:
-        # Step 1 — Convert the query to a vector via HuggingFace API.
-        query_vector = text_to_vector(request.query_text)
+        # Step 1 — Convert the query to a vector via HuggingFace API (batched).
+        query_vector = await embed(request.query_text)
 
         # Step 2 — Search the user's memory store in Pinecone.
-        memories = search_memories(
+        DB_CALLS.labels(op="search").inc()
+        memories = await run_in_threadpool(
+            search_memories,
             email=request.email,
             query_vector=query_vector,
             limit=5,
         )
 
         # Step 3 — Return the results.
-        return RecallResponse(
-            email=request.email,
-            query_text=request.query_text,
-            memories=memories,
+        return ORJSONResponse({
+            "email": request.email,
+            "query_text": request.query_text,
+            "memories": memories,
+        })
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    finally:
+        RECALL_SECONDS.observe(time.perf_counter() - started)
+
+
+# ---------------------------------------------------------------------------
+# POST /remember/batch — store many memories in one call
+# ---------------------------------------------------------------------------
+@app.post("/remember/batch", responses={200: {"model": RememberBatchResponse}}, tags=["Memory"])
+async def remember_batch(request: RememberBatchRequest):
+    """
+    Store several memories at once: all texts are embedded in a single
+    HuggingFace request, then queued for Pinecone together.
+    """
+    try:
+        # Step 1 — Embed every text in one API call.
+        vectors = await run_in_threadpool(
+            texts_to_vectors, [item.text for item in request.items]
         )
 
+        # Step 2 — Persist to Pinecone (the upserts are batched by database.py).
+        DB_CALLS.labels(op="save").inc(len(request.items))
+        memory_ids = await run_in_threadpool(_save_all, request.items, vectors)
+
+        # Step 3 — Respond with success.
+        return ORJSONResponse({
+            "status": "saved",
+            "memory_ids": memory_ids,
+        })
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _save_all(items, vectors):
+    """Save each item with its vector, returning the new memory IDs in order."""
+    return [
+        save_memory(email=item.email, text=item.text, vector=vector)
+        for item, vector in zip(items, vectors)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# POST /recall/batch — run many recalls in one call
+# ---------------------------------------------------------------------------
+@app.post("/recall/batch", responses={200: {"model": RecallBatchResponse}}, tags=["Memory"])
+async def recall_batch(request: RecallBatchRequest):
+    """
+    Run several recalls at once: all queries are embedded in a single
+    HuggingFace request, then the Pinecone searches run concurrently.
+    """
+    try:
+        # Step 1 — Embed every query in one API call.
+        query_vectors = await run_in_threadpool(
+            texts_to_vectors, [item.query_text for item in request.items]
+        )
+
+        # Step 2 — Search each user's memory store concurrently.
+        DB_CALLS.labels(op="search").inc(len(request.items))
+        all_memories = await asyncio.gather(*(
+            run_in_threadpool(
+                search_memories,
+                email=item.email,
+                query_vector=query_vector,
+                limit=5,
+            )
+            for item, query_vector in zip(request.items, query_vectors)
+        ))
+
+        # Step 3 — Return the results in request order.
+        return ORJSONResponse({
+            "results": [
+                {
+                    "email": item.email,
+                    "query_text": item.query_text,
+                    "memories": memories,
+                }
+                for item, memories in zip(request.items, all_memories)
+            ]
+        })
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -140,6 +403,29 @@ async def recall(request: RecallRequest):
 # ---------------------------------------------------------------------------
 # Direct execution (alternative to `uvicorn memory_api:app`)
 # ---------------------------------------------------------------------------
-if __name__ == "__main__":
+if __name__ == "__main__" and os.getenv("ZEN_HTTP2") == "1":
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    config = Config()
+    config.bind = ["0.0.0.0:8100"]
+    config.alpn_protocols = ["h2", "http/1.1"]
+    config.keep_alive_timeout = 75
+    asyncio.run(serve(app, config))
+
+elif __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8100)
+    # uvloop + httptools are the C-backed loop / parser from uvicorn[standard].
+    # Each worker process runs its own embedding worker and caches.  Several
+    # workers need the import string; a single one gets the app object, so
+    # this file isn't imported a second time.
+    workers = int(os.getenv("ZEN_WORKERS", "1"))
+    uvicorn.run(
+        "memory_api:app" if workers > 1 else app,
+        host="0.0.0.0",
+        port=8100,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+        backlog=2048,
+    )
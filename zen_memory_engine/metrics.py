@@ -0,0 +1,47 @@
+"""
+metrics.py — Prometheus Metrics for the Memory Engine
+=====================================================
+Defines the metric objects served at GET /metrics by memory_api.py.
+
+They live in their own module because `python memory_api.py` hands uvicorn
+the "memory_api:app" import string, so memory_api.py is executed twice per
+process (once as __main__, once as memory_api).  Python imports this module
+only once, so each metric is registered exactly once in the global registry.
+
+Note: every worker process keeps its own counters.  Run a single worker
+(the ZEN_WORKERS default) when these numbers are used for sizing.
+
+Usage:
+    from metrics import RECALL_SECONDS, DB_CALLS
+    DB_CALLS.labels(op="search").inc()
+"""
+
+from prometheus_client import REGISTRY, Counter, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from embedder import cache_stats
+
+
+RECALL_SECONDS = Histogram(
+    "zen_recall_seconds",
+    "Wall-clock time of /recall requests",
+    buckets=(.001, .005, .01, .025, .05, .1, .25, .5, 1),
+)
+DB_CALLS = Counter(
+    "zen_db_calls",
+    "Pinecone operations issued by the memory API",
+    ["op"],
+)
+
+
+class EmbedderCacheCollector:
+    """Expose embedder.cache_stats() at scrape time — no cost per request."""
+
+    def collect(self):
+        stats = cache_stats()
+        yield CounterMetricFamily("zen_emb_hit", "Embedding cache hits", value=stats["hits"])
+        yield CounterMetricFamily("zen_emb_miss", "Embedding cache misses", value=stats["misses"])
+        yield GaugeMetricFamily("zen_emb_cache_entries", "Vectors held in the embedding cache", value=stats["size"])
+
+
+REGISTRY.register(EmbedderCacheCollector())